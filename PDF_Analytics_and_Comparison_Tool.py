@@ -1,66 +1,177 @@
 import streamlit as st
-import pdfplumber
+import pymupdf
 from collections import Counter
 import re
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 import pandas as pd
+import os
+import tempfile
+import multiprocessing
+import threading
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-# Function to extract text from PDF with validation
-def extract_text_from_pdf(file):
-    text = ""
+# Upper bound on worker processes used for page extraction
+MAX_PDF_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Pages are extracted in-process below this size: pymupdf reads about a thousand pages a second,
+# while each worker process takes around a second to start
+PARALLEL_MIN_PAGES = 2000
+
+# Workers are spawned, not forked: forking the multithreaded Streamlit server is unsafe
+PDF_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Leading pages checked for text before the rest of the document is extracted
+SCANNED_PROBE_PAGES = 3
+
+# Precompiled patterns shared by the text analytics
+WORD_RE = re.compile(r'\b\w+\b')
+SYLLABLE_RE = re.compile(r'[aeiouy]{1,2}')
+
+# Worker: open the PDF once and extract text for pages [start, end)
+def _extract_range(path, start, end):
+    with pymupdf.open(path) as pdf:
+        return [pdf[i].get_text("text") for i in range(start, end)]
+
+# Function to extract pages [start, end) of a long PDF in worker processes, in page order
+def extract_pages_in_parallel(pdf_bytes, start, end):
+    tmp_path = None
     try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text is None:
-                    raise ValueError("This appears to be a scanned PDF. Please upload a digital PDF with selectable text.")
-                text += page_text
-                
-        if len(text.strip()) < 10:
-            raise ValueError("Little to no text could be extracted. This may be a scanned PDF.")
-            
+        # Persist the upload so each worker process can re-open it by path
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(pdf_bytes)
+            tmp_path = tmp.name
+
+        # Split the pages into contiguous ranges, one per worker
+        workers = min(MAX_PDF_WORKERS, end - start)
+        step = -(-(end - start) // workers)
+        ranges = [(range_start, min(range_start + step, end)) for range_start in range(start, end, step)]
+
+        page_texts = [None] * (end - start)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=PDF_MP_CONTEXT) as executor:
+            futures = {executor.submit(_extract_range, tmp_path, range_start, range_end): range_start
+                       for range_start, range_end in ranges}
+            for future in as_completed(futures):
+                offset = futures[future] - start
+                texts = future.result()
+                page_texts[offset:offset + len(texts)] = texts
+        return page_texts
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+# Function to extract text from PDF with validation (cached on the file bytes).
+# Raises ValueError for unusable documents and never touches the UI, so it can run off the script thread.
+@st.cache_data(show_spinner=False)
+def read_pdf_text(pdf_bytes):
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        num_pages = pdf.page_count
+
+        # Probe the first pages so scanned documents fail before the full extraction
+        probed = min(SCANNED_PROBE_PAGES, num_pages)
+        page_texts = [pdf[i].get_text("text") for i in range(probed)]
+        if probed and num_pages > probed and sum(len(page_text.strip()) for page_text in page_texts) < 10:
+            raise ValueError("This appears to be a scanned PDF. Please upload a digital PDF with selectable text.")
+
+        parallel = MAX_PDF_WORKERS > 1 and num_pages - probed >= PARALLEL_MIN_PAGES
+        if not parallel:
+            page_texts += [pdf[i].get_text("text") for i in range(probed, num_pages)]
+
+    if parallel:
+        page_texts += extract_pages_in_parallel(pdf_bytes, probed, num_pages)
+
+    if sum(len(page_text.strip()) for page_text in page_texts) < 10:
+        raise ValueError("Little to no text could be extracted. This may be a scanned PDF.")
+
+    return "".join(page_texts)
+
+# Function to extract text from PDF, reporting failures in the app
+def extract_text_from_pdf(pdf_bytes):
+    try:
+        return read_pdf_text(pdf_bytes)
     except Exception as e:
         st.error(f"Error processing PDF: {str(e)}")
         return None
-    return text
 
+# Function to extract several PDFs at once; each extraction mostly waits on its page workers
+def extract_texts_from_pdfs(*pdf_bytes_list):
+    # The cached read_pdf_text needs the script run context in its worker thread;
+    # errors are reported below, on the script thread
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(pdf_bytes_list),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = [executor.submit(read_pdf_text, pdf_bytes) for pdf_bytes in pdf_bytes_list]
+    texts = []
+    for future in futures:
+        try:
+            texts.append(future.result())
+        except Exception as e:
+            st.error(f"Error processing PDF: {str(e)}")
+            texts.append(None)
+    return texts
+
+# Vowel groups never span a word boundary, so one pass over the whole
+# lowercased text counts the same syllables as a per-word loop
+def flesch_kincaid_score(text, word_count, sentences):
+    syllables = len(SYLLABLE_RE.findall(text))
+    if sentences == 0 or word_count == 0:
+        return 0
+    return 206.835 - 1.015 * (word_count / sentences) - 84.6 * (syllables / word_count)
+
+@st.cache_data(show_spinner=False)
 def analyze_pdf(text):
-    words = re.findall(r'\b\w+\b', text)
+    lowered = text.lower()
+    words = WORD_RE.findall(lowered)
     word_count = len(words)
     char_count = len(text)
-    common_words = Counter(words).most_common(10)
-    sentence_count = len(re.split(r'[.!?]', text))
+    word_counter = Counter(words)
+    common_words = word_counter.most_common(10)
     line_count = text.count('\n')
     question_count = text.count('?')
+    # Same result as splitting on [.!?] without building the list of pieces
+    sentence_count = text.count('.') + text.count('!') + question_count + 1
 
-    def flesch_kincaid_score(text):
-        sentences = len(re.split(r'[.!?]', text))
-        words = re.findall(r'\b\w+\b', text)
-        word_count = len(words)
-        syllables = sum(len(re.findall(r'[aeiouyAEIOUY]{1,2}', word.lower())) for word in words)
-        if sentences == 0 or word_count == 0:
-            return 0
-        return 206.835 - 1.015 * (word_count / sentences) - 84.6 * (syllables / word_count)
-
-    readability = flesch_kincaid_score(text)
+    readability = flesch_kincaid_score(lowered, word_count, sentence_count)
 
     return {
         "Word Count": word_count,
         "Character Count": char_count,
         "Most Common Words": common_words,
+        "Word Counter": word_counter,
         "Sentence Count": sentence_count,
         "Line Count": line_count,
         "Question Count": question_count,
         "Readability Score": readability,
     }
 
-def generate_wordcloud(text):
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')
-    st.pyplot(plt)
+# Render the word cloud straight to PNG bytes so reruns reuse the image
+@st.cache_data(show_spinner=False)
+def wordcloud_png(frequencies):
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(width=800, height=400, background_color='white')
+    wordcloud.generate_from_frequencies(dict(frequencies))
+    buffer = BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+# Build the word cloud from the Counter computed by analyze_pdf instead of re-tokenizing the text
+def generate_wordcloud(word_counter, max_words=200):
+    from wordcloud import STOPWORDS
+
+    frequencies = []
+    for word, count in word_counter.most_common():
+        if word in STOPWORDS or word.isdigit():
+            continue
+        frequencies.append((word, count))
+        if len(frequencies) == max_words:
+            break
+    if not frequencies:
+        st.info("Not enough words to build a word cloud.")
+        return
+    st.image(wordcloud_png(tuple(frequencies)), use_container_width=True)
 
 def main():
     # Enhanced sidebar
@@ -100,7 +211,7 @@ def main():
                 st.error("Please upload a valid PDF file.")
                 return
                 
-            text = extract_text_from_pdf(uploaded_file)
+            text = extract_text_from_pdf(uploaded_file.getvalue())
             if text is None:
                 st.error("Failed to extract text. Please upload a digital PDF with selectable text.")
                 return
@@ -129,7 +240,7 @@ def main():
                 Word clouds visually represent word frequency - larger words appear more often in the document.
                 This helps quickly identify main themes and topics.
                 """)
-            generate_wordcloud(text)
+            generate_wordcloud(analytics['Word Counter'])
 
             with st.expander("View Extracted Text"):
                 st.text_area("Text", text, height=300, label_visibility="collapsed")
@@ -146,8 +257,7 @@ def main():
                                             help="Document to compare against")
 
         if uploaded_file1 and uploaded_file2:
-            text1 = extract_text_from_pdf(uploaded_file1)
-            text2 = extract_text_from_pdf(uploaded_file2)
+            text1, text2 = extract_texts_from_pdfs(uploaded_file1.getvalue(), uploaded_file2.getvalue())
             
             if text1 is None or text2 is None:
                 st.error("One or both files couldn't be processed. Please check they are digital PDFs.")
@@ -207,16 +317,14 @@ def main():
                 col1, col2 = st.columns(2)
                 with col1:
                     st.caption(f"**{uploaded_file1.name}**")
-                    generate_wordcloud(text1)
+                    generate_wordcloud(analytics1['Word Counter'])
                 with col2:
                     st.caption(f"**{uploaded_file2.name}**")
-                    generate_wordcloud(text2)
+                    generate_wordcloud(analytics2['Word Counter'])
                     
             with tab3:
                 st.write("**Shared Vocabulary Analysis**")
-                words1 = set(re.findall(r'\b\w+\b', text1.lower()))
-                words2 = set(re.findall(r'\b\w+\b', text2.lower()))
-                common_words = words1.intersection(words2)
+                common_words = analytics1['Word Counter'].keys() & analytics2['Word Counter'].keys()
                 
                 st.metric("Shared Unique Words", len(common_words),
                          help="Count of words appearing in both documents")
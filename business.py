@@ -1,14 +1,131 @@
 import streamlit as st
 import pandas as pd
 import sqlalchemy
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
-from fpdf import FPDF
-import base64
+import os
+
+# Optional: connectorx decodes query results straight into columnar buffers
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+# Dialect-specific expression that truncates order_date to the first day of its month;
+# grouping on dates avoids formatting a string for every order row
+MONTH_EXPRESSIONS = {
+    "mysql": "DATE_SUB(DATE(order_date), INTERVAL DAYOFMONTH(order_date) - 1 DAY)",
+    "postgresql": "CAST(DATE_TRUNC('month', order_date) AS DATE)",
+    "sqlite": "date(order_date, 'start of month')",
+}
+
+# Aggregate queries; the database returns only the summarized rows
+TOTALS_QUERY = "SELECT SUM(revenue) AS total_revenue, SUM(profit) AS total_profit FROM orders"
+
+MONTHLY_REVENUE_QUERY = """
+SELECT {month} AS month, SUM(revenue) AS revenue
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY {month}
+ORDER BY month
+"""
+
+CUSTOMER_COUNTS_QUERY = """
+SELECT SUM(CASE WHEN order_count > 1 THEN 1 ELSE 0 END) AS repeat_customers,
+       SUM(CASE WHEN order_count = 1 THEN 1 ELSE 0 END) AS new_customers
+FROM (
+    SELECT customer_id, COUNT(*) AS order_count
+    FROM orders
+    WHERE customer_id IS NOT NULL
+    GROUP BY customer_id
+) customer_orders
+"""
+
+REGION_COUNTS_QUERY = """
+SELECT region, COUNT(*) AS customer_count
+FROM orders
+WHERE region IS NOT NULL
+GROUP BY region
+ORDER BY customer_count DESC
+"""
+
+REGION_SALES_QUERY = """
+SELECT region, SUM(revenue) AS revenue
+FROM orders
+WHERE region IS NOT NULL
+GROUP BY region
+ORDER BY region
+"""
+
+# Orders are reduced to one row per product before joining the products lookup
+CATEGORY_STATS_QUERY = """
+SELECT p.product_category, SUM(o.sales_count) AS sales_count, SUM(o.profit) AS profit
+FROM (
+    SELECT product_id, COUNT(*) AS sales_count, SUM(profit) AS profit
+    FROM orders
+    GROUP BY product_id
+) o
+JOIN products p ON o.product_id = p.product_id
+WHERE p.product_category IS NOT NULL
+GROUP BY p.product_category
+ORDER BY sales_count DESC
+"""
+
+LOW_STOCK_QUERY = """
+SELECT DISTINCT product_name, product_category
+FROM products
+WHERE stock_level < 10
+  AND product_id IN (SELECT product_id FROM orders)
+"""
+
+# Function to create the database engine once per connection string; its pool is reused across reruns
+@st.cache_resource(show_spinner=False)
+def get_engine(connection_string):
+    return sqlalchemy.create_engine(connection_string, pool_pre_ping=True)
+
+# Function to run an aggregate query on a pooled connection and return the result as a DataFrame
+def run_query(engine, query):
+    with engine.connect() as connection:
+        return pd.read_sql(sqlalchemy.text(query), connection)
+
+# Function to build a connectorx URL from a SQLAlchemy one (plain scheme, absolute SQLite path)
+def connectorx_url(url):
+    url = url.set(drivername=url.get_backend_name())
+    if url.get_backend_name() == "sqlite":
+        url = url.set(database=os.path.abspath(url.database))
+    return url.render_as_string(hide_password=False)
+
+# Function to load a full table, preferring connectorx and falling back to pandas
+def read_table(engine, table):
+    query = f"SELECT * FROM {table}"
+    parse_dates = ["order_date"] if table == "orders" else None
+    if cx is not None:
+        try:
+            df_table = cx.read_sql(connectorx_url(engine.url), query, return_type="pandas")
+            for col in parse_dates or []:
+                df_table[col] = pd.to_datetime(df_table[col])
+            return df_table
+        except Exception:
+            pass
+    with engine.connect() as connection:
+        return pd.read_sql(query, connection, parse_dates=parse_dates)
+
+# Function to draw a DataFrame as a bordered table, one cell per value
+def render_dataframe(pdf, df, row_height=8):
+    col_width = (pdf.w - 2 * pdf.l_margin) / len(df.columns)
+    pdf.set_font("Arial", size=10, style="B")
+    for col in df.columns:
+        pdf.cell(col_width, row_height, str(col), border=1)
+    pdf.ln(row_height)
+    pdf.set_font("Arial", size=10)
+    for row in df.itertuples(index=False):
+        for value in row:
+            pdf.cell(col_width, row_height, str(value), border=1)
+        pdf.ln(row_height)
 
 # Function to create a PDF report
 def create_pdf(analysis_results):
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -24,24 +141,13 @@ def create_pdf(analysis_results):
         if isinstance(content, str):
             pdf.multi_cell(0, 10, txt=content)
         elif isinstance(content, pd.DataFrame):
-            # Convert DataFrame to string without index
-            table_content = content.to_string(index=False)
-            # Add table headers
-            headers = " | ".join(content.columns)
-            pdf.multi_cell(0, 10, txt=headers)
-            pdf.multi_cell(0, 10, txt=table_content)
+            render_dataframe(pdf, content)
         pdf.ln(5)
 
     # Save the PDF to a file
     pdf_output = pdf.output(dest="S")  # Returns a bytearray
     return pdf_output  # Return the bytearray directly
 
-# Function to generate a download link for the PDF
-def get_download_link(pdf_output, filename="report.pdf"):
-    b64 = base64.b64encode(pdf_output).decode()  # Encode bytes to base64
-    href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">Download PDF Report</a>'
-    return href
-
 def main():
     # Title of the app
     st.title("Business Analytics Dashboard for Actionable Insights")
@@ -68,8 +174,9 @@ def main():
 
     # Connect to the database
     try:
-        engine = sqlalchemy.create_engine(connection_string)
-        connection = engine.connect()
+        engine = get_engine(connection_string)
+        with engine.connect():
+            pass
         st.sidebar.success("Connected to the database successfully!")
     except Exception as e:
         st.sidebar.error(f"Error connecting to the database: {e}")
@@ -90,46 +197,33 @@ def main():
         st.error(f"The following required tables are missing in the database: {', '.join(missing_tables)}")
         st.stop()
     
-    # Fetch data from all tables
-    dataframes = {}
-    for table in tables:
-        query = f"SELECT * FROM {table}"
-        dataframes[table] = pd.read_sql(query, connection)
-        st.write(f"Loaded {len(dataframes[table])} rows from table: {table}")
-
-    # Display column names for each table
-    for table, df_table in dataframes.items():
-        st.write(f"Columns in {table}: {df_table.columns.tolist()}")
-   
-    # Drop the 'region' column from the 'customers' table to avoid redundancy
-    if "customers" in dataframes:
-        dataframes["customers"] = dataframes["customers"].drop(columns=["region"])
-
-    # Check for missing keys
-    df_orders = dataframes.get("orders")
-    df_customers = dataframes.get("customers")
-    df_products = dataframes.get("products")
-
-    if df_orders is not None and df_customers is not None:
-        df = pd.merge(df_orders, df_customers, on="customer_id", how="left")
-    if df_products is not None:
-        df = pd.merge(df, df_products, on="product_id", how="left")
-
-    # Debug: Display the first few rows of the DataFrame
-    st.subheader("Final Joined DataFrame")
-    st.write(f"Total rows in final DataFrame: {len(df)}")
-    st.dataframe(df, hide_index=True)  # Display DataFrame without index
-   
-        
-    # Ensure the data has the required columns for business analytics
-    required_columns = ["order_date", "revenue", "profit", "product_category", "region", "customer_id"]
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    # Check the columns the aggregate queries rely on
+    inspector = sqlalchemy.inspect(engine)
+    table_columns = {table: {column["name"] for column in inspector.get_columns(table)} for table in required_tables}
+    required_columns = {
+        "orders": ["order_date", "revenue", "profit", "region", "customer_id", "product_id"],
+        "products": ["product_id", "product_category"],
+    }
+    missing_columns = [f"{table}.{col}" for table, cols in required_columns.items() for col in cols if col not in table_columns[table]]
     if missing_columns:
-        st.error(f"The table is missing the following required columns: {missing_columns}")
+        st.error(f"The tables are missing the following required columns: {missing_columns}")
         st.stop()
 
-    # Convert date column to datetime
-    df["order_date"] = pd.to_datetime(df["order_date"])
+    # Optionally load and join the raw tables for inspection
+    if st.checkbox("Show raw rows", help="Load and join the full orders, customers and products tables"):
+        dataframes = {}
+        for table in required_tables:
+            dataframes[table] = read_table(engine, table)
+
+        # Drop the 'region' column from the 'customers' table to avoid redundancy
+        dataframes["customers"] = dataframes["customers"].drop(columns=["region"], errors="ignore")
+
+        df = pd.merge(dataframes["orders"], dataframes["customers"], on="customer_id", how="left")
+        df = pd.merge(df, dataframes["products"], on="product_id", how="left")
+
+        st.subheader("Final Joined DataFrame")
+        st.write(f"Total rows in final DataFrame: {len(df)}")
+        st.dataframe(df, hide_index=True)  # Display DataFrame without index
 
     # Business Analytics
     st.header("Business Performance Overview")
@@ -138,8 +232,9 @@ def main():
     st.subheader("Revenue and Profit Analysis")
 
     # Total Revenue and Profit
-    total_revenue = df["revenue"].sum()
-    total_profit = df["profit"].sum()
+    totals = run_query(engine, TOTALS_QUERY).fillna(0)
+    total_revenue = totals["total_revenue"].iloc[0]
+    total_profit = totals["total_profit"].iloc[0]
     profit_margin = (total_profit / total_revenue) * 100
 
     col1, col2, col3 = st.columns(3)
@@ -149,9 +244,9 @@ def main():
 
     # Monthly Revenue Trend
     st.subheader("Monthly Revenue Trend")
-    df["month"] = df["order_date"].dt.to_period("M")
-    monthly_revenue = df.groupby("month")["revenue"].sum().reset_index()
-    monthly_revenue["month"] = monthly_revenue["month"].astype(str)
+    month_expression = MONTH_EXPRESSIONS[engine.dialect.name]
+    monthly_revenue = run_query(engine, MONTHLY_REVENUE_QUERY.format(month=month_expression))
+    monthly_revenue["month"] = pd.to_datetime(monthly_revenue["month"]).dt.strftime("%Y-%m")
 
     fig = px.line(monthly_revenue, x="month", y="revenue", title="Monthly Revenue Over Time")
     st.plotly_chart(fig)
@@ -160,8 +255,9 @@ def main():
     st.subheader("Customer Analysis")
 
     # Repeat Customers vs. New Customers
-    repeat_customers = df["customer_id"].value_counts().gt(1).sum()
-    new_customers = df["customer_id"].nunique() - repeat_customers
+    customer_counts = run_query(engine, CUSTOMER_COUNTS_QUERY).fillna(0)
+    repeat_customers = int(customer_counts["repeat_customers"].iloc[0])
+    new_customers = int(customer_counts["new_customers"].iloc[0])
 
     col1, col2 = st.columns(2)
     col1.metric("Repeat Customers", repeat_customers)
@@ -169,7 +265,7 @@ def main():
 
     # Customer Segmentation by Region
     st.subheader("Customer Segmentation by Region")
-    region_counts = df["region"].value_counts().reset_index()
+    region_counts = run_query(engine, REGION_COUNTS_QUERY)
     region_counts.columns = ["Region", "Customer Count"]
 
     fig = px.bar(region_counts, x="Region", y="Customer Count", title="Customers by Region")
@@ -178,9 +274,11 @@ def main():
     # 3. Sales Analysis
     st.subheader("Sales Analysis")
 
-    # Top-Selling Products
+    # Top-Selling Products and profit per category in one query
+    category_stats = run_query(engine, CATEGORY_STATS_QUERY)
+
     st.subheader("Top-Selling Products")
-    top_products = df["product_category"].value_counts().reset_index()
+    top_products = category_stats[["product_category", "sales_count"]].copy()
     top_products.columns = ["Product Category", "Sales Count"]
 
     fig = px.bar(top_products, x="Product Category", y="Sales Count", title="Top-Selling Products")
@@ -188,7 +286,7 @@ def main():
 
     # Sales Performance by Region
     st.subheader("Sales Performance by Region")
-    region_sales = df.groupby("region")["revenue"].sum().reset_index()
+    region_sales = run_query(engine, REGION_SALES_QUERY)
 
     fig = px.pie(region_sales, values="revenue", names="region", title="Revenue by Region")
     st.plotly_chart(fig)
@@ -196,10 +294,12 @@ def main():
     # 4. Inventory Analysis
     st.subheader("Inventory Analysis")
 
-    # Check if the required columns exist in the DataFrame
-    if "stock_level" in df.columns and "product_name" in df.columns and "product_category" in df.columns:
-        # Filter products with low stock levels
-        low_stock_products = df[df["stock_level"] < 10][["product_name", "product_category"]].drop_duplicates()
+    # Check if the required columns exist in the products table
+    has_stock_data = {"stock_level", "product_name"} <= table_columns["products"]
+    low_stock_products = pd.DataFrame(columns=["product_name", "product_category"])
+    if has_stock_data:
+        # Ordered products with low stock levels
+        low_stock_products = run_query(engine, LOW_STOCK_QUERY)
         
         # Display low stock products
         if not low_stock_products.empty:
@@ -218,7 +318,7 @@ def main():
     st.warning(f"Low-performing regions : {', '.join(low_performing_regions['region'])}. Consider targeted marketing campaigns.")
 
     # Insight 2: High-Profit Products
-    high_profit_products = df.groupby("product_category")["profit"].sum().idxmax()
+    high_profit_products = category_stats.set_index("product_category")["profit"].idxmax()
     st.success(f"Highest profit-generating product category : {high_profit_products}. Focus on promoting this category.")
 
     # Insight 3: Declining Monthly Revenue
@@ -228,9 +328,6 @@ def main():
         if last_month_revenue < second_last_month_revenue:
             st.error("Revenue declined last month. Investigate potential causes.")
 
-    # Close the database connection
-    connection.close()
-
     # Prepare analysis results for PDF export
     analysis_results = {
         "Revenue and Profit Analysis": f"""
@@ -242,27 +339,22 @@ def main():
         Repeat Customers: {repeat_customers}
         New Customers: {new_customers}
         """,
-        "Sales Analysis": f"""
-        Top-Selling Products:
-        {top_products.to_string(index=False)}
-        """,
-        "Inventory Analysis": f"""
-        Products with low stock levels:
-        {low_stock_products.to_string(index=False) if 'stock_level' in df.columns and not low_stock_products.empty else 'No products with low stock levels.'}
-        """,
+        "Sales Analysis": top_products,
+        "Inventory Analysis": low_stock_products if not low_stock_products.empty else "No products with low stock levels.",
         "Actionable Insights": f"""
         Low-Performing Regions: {', '.join(low_performing_regions['region'])}
         Highest Profit-Generating Product Category: {high_profit_products}
         """
     }
 
-    # Debug: Print the analysis results
-    st.subheader("Analysis Results for PDF")
-    st.write(analysis_results)
-
-    # Generate PDF and provide download link
+    # Generate PDF and provide download button
     pdf_output = create_pdf(analysis_results)
-    st.markdown(get_download_link(pdf_output), unsafe_allow_html=True)
+    st.download_button(
+        label="Download PDF Report",
+        data=bytes(pdf_output),
+        file_name="report.pdf",
+        mime="application/pdf"
+    )
 
 
 # Run the app
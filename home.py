@@ -1,5 +1,14 @@
 import streamlit as st
 
+# HTML for a single "How to Use" step card
+STEP_CARD_TEMPLATE = """
+<div class="step-card">
+    <div class="step-number">{number}</div>
+    <div class="step-title">{title}</div>
+    <div class="step-content">{content}</div>
+</div>
+"""
+
 def show():
     # Custom CSS for the steps layout
     st.markdown("""
@@ -70,21 +79,9 @@ def show():
         {"number": "4.", "title": "Export Reports", "content": "Generate and download reports in PDF format"}
     ]
     
-    # Create the steps container
-    st.markdown('<div class="steps-container">', unsafe_allow_html=True)
-    
-    # Add step cards
-    for step in steps:
-        st.markdown(f"""
-        <div class="step-card">
-            <div class="step-number">{step['number']}</div>
-            <div class="step-title">{step['title']}</div>
-            <div class="step-content">{step['content']}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Close the container
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Build the steps container with all step cards and send it as one element
+    step_cards = "".join(STEP_CARD_TEMPLATE.format(**step) for step in steps)
+    st.markdown(f'<div class="steps-container">{step_cards}</div>', unsafe_allow_html=True)
     
     # Platforms section
     st.header("🌟 Available Platforms", divider='rainbow')
@@ -1,47 +1,63 @@
 import streamlit as st
 import ast
 import pandas as pd
-import matplotlib.pyplot as plt
 from io import BytesIO
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from streamlit_extras.metric_cards import style_metric_cards
 import plotly.express as px
 
-# Function to analyze the Python code
-def analyze_code(code):
-    try:
-        # Parse the code into an Abstract Syntax Tree (AST)
-        tree = ast.parse(code)
+# AST visitor collecting function, class and import information in one traversal
+class CodeAnalyzer(ast.NodeVisitor):
+    def __init__(self):
+        self.function_names = []
+        self.class_names = []
+        self.dependencies = []  # Deduplicated once after the traversal
+        self.num_imports = 0
+
+    def visit_FunctionDef(self, node):
+        self.function_names.append(node.name)
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.class_names.append(node.name)
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        # Handle `import xyz` statements
+        for alias in node.names:
+            self.dependencies.append(alias.name)
+        self.num_imports += len(node.names)
+
+    def visit_ImportFrom(self, node):
+        # Handle `from xyz import abc` statements
+        if node.module:
+            self.dependencies.append(node.module)
+            self.num_imports += 1
 
-        # Initialize counters
-        num_lines = len(code.splitlines())
-        num_functions = 0
-        num_classes = 0
-        num_imports = 0
-        function_names = []
-        class_names = []
-        dependencies = set()  # To store unique dependencies
+# Function to analyze the Python code given as raw bytes (cached on the source across reruns)
+@st.cache_data(show_spinner=False)
+def analyze_code(source):
+    try:
+        # Count newlines in one scan instead of building a list of lines
+        num_lines = source.count(b"\n")
+        if source and not source.endswith(b"\n"):
+            num_lines += 1
 
-        # Traverse the AST to count functions, classes, and imports
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                num_functions += 1
-                function_names.append(node.name)
-            elif isinstance(node, ast.ClassDef):
-                num_classes += 1
-                class_names.append(node.name)
-            elif isinstance(node, ast.Import):
-                # Handle `import xyz` statements
-                for alias in node.names:
-                    dependencies.add(alias.name)
-                    num_imports += 1
-            elif isinstance(node, ast.ImportFrom):
-                # Handle `from xyz import abc` statements
-                module = node.module
-                if module:
-                    dependencies.add(module)
-                    num_imports += 1
+        # Parse the code into an Abstract Syntax Tree (AST) and collect functions, classes, and imports
+        analyzer = CodeAnalyzer()
+        analyzer.visit(ast.parse(source))
+        function_names = analyzer.function_names
+        class_names = analyzer.class_names
+        # Sort once, then drop adjacent duplicates to get the unique dependencies
+        dependencies = analyzer.dependencies
+        dependencies.sort()
+        dependencies = [dep for i, dep in enumerate(dependencies) if i == 0 or dependencies[i - 1] != dep]
+        num_functions = len(function_names)
+        num_classes = len(class_names)
+        num_imports = analyzer.num_imports
 
         # Calculate code composition percentages
         total_components = num_functions + num_classes + num_imports
@@ -60,7 +76,7 @@ def analyze_code(code):
             "num_imports": num_imports,
             "function_names": function_names,
             "class_names": class_names,
-            "dependencies": sorted(dependencies),
+            "dependencies": dependencies,
             "composition": {
                 "functions": func_percent,
                 "classes": class_percent,
@@ -71,7 +87,30 @@ def analyze_code(code):
         st.error(f"Error analyzing code: {e}")
         return None
 
-# Function to generate a PDF file
+# Function to draw a titled list of pre-formatted lines with one text object per page; returns the next y position.
+# showPage() resets the canvas to its default Helvetica 12, so the body font needs no re-selection on new pages.
+def draw_section(pdf, title, lines, y, line_height=20, bottom=50, top=750):
+    if y < bottom:
+        pdf.showPage()
+        y = top
+    pdf.drawString(72, y, title)
+    y -= line_height
+
+    while lines:
+        if y < bottom:
+            pdf.showPage()
+            y = top
+        per_page = (y - bottom) // line_height + 1
+        chunk, lines = lines[:per_page], lines[per_page:]
+        text = pdf.beginText(100, y)
+        text.setLeading(line_height)
+        text.textLines(chunk)
+        pdf.drawText(text)
+        y -= line_height * len(chunk)
+    return y
+
+# Function to generate a PDF file (cached on the analysis result; returns the PDF bytes)
+@st.cache_data(show_spinner=False, max_entries=8)
 def generate_pdf(analysis_result):
     buffer = BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=letter)
@@ -90,45 +129,18 @@ def generate_pdf(analysis_result):
     pdf.drawString(100, 660, f"Number of Classes: {analysis_result['num_classes']}")
     pdf.drawString(100, 640, f"Number of Imports: {analysis_result['num_imports']}")
     
-    # Functions section
-    if analysis_result["function_names"]:
-        pdf.drawString(72, 610, "Functions:")
-        y = 590
-        for i, func in enumerate(analysis_result["function_names"], 1):
-            pdf.drawString(100, y, f"{i}. {func}")
-            y -= 20
-            if y < 50:
-                pdf.showPage()
-                pdf.setFont("Helvetica", 12)
-                y = 750
-
-    # Classes section
-    if analysis_result["class_names"]:
-        pdf.drawString(72, y, "Classes:")
-        y -= 20
-        for i, cls in enumerate(analysis_result["class_names"], 1):
-            pdf.drawString(100, y, f"{i}. {cls}")
-            y -= 20
-            if y < 50:
-                pdf.showPage()
-                pdf.setFont("Helvetica", 12)
-                y = 750
-
-    # Dependencies section
-    if analysis_result["dependencies"]:
-        pdf.drawString(72, y, "Dependencies:")
-        y -= 20
-        for i, dep in enumerate(analysis_result["dependencies"], 1):
-            pdf.drawString(100, y, f"{i}. {dep}")
-            y -= 20
-            if y < 50:
-                pdf.showPage()
-                pdf.setFont("Helvetica", 12)
-                y = 750
+    # Functions, classes and dependencies sections, formatted up front as numbered lines
+    sections = [
+        (title, [f"{i}. {name}" for i, name in enumerate(analysis_result[key], 1)])
+        for title, key in (("Functions:", "function_names"), ("Classes:", "class_names"), ("Dependencies:", "dependencies"))
+    ]
+    y = 610
+    for title, lines in sections:
+        if lines:
+            y = draw_section(pdf, title, lines, y)
 
     pdf.save()
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
 
 # Helper function to create DataFrames with index starting from 1
 def create_indexed_dataframe(data, column_name):
@@ -208,19 +220,25 @@ def main():
     )
 
     if uploaded_file is not None:
-        # Read the file content
-        code = uploaded_file.read().decode("utf-8")
+        # Keep the raw bytes; ast decodes them (honouring any coding cookie)
+        source = uploaded_file.getvalue()
         
         # Display the file name
         st.success(f"File uploaded successfully: {uploaded_file.name}")
         
         # Add an expander to view the code
         with st.expander("View Uploaded Code", expanded=False):
-            st.code(code, language='python')
+            st.code(source.decode("utf-8", errors="replace"), language='python')
 
-        # Analyze the code
-        with st.spinner("Analyzing code..."):
-            analysis_result = analyze_code(code)
+        # Analyze the code once per upload; reruns reuse the stored result without re-hashing the source
+        if st.session_state.get("code_file_id") == uploaded_file.file_id:
+            analysis_result = st.session_state.code_analysis_result
+        else:
+            with st.spinner("Analyzing code..."):
+                analysis_result = analyze_code(source)
+            if analysis_result:
+                st.session_state.code_file_id = uploaded_file.file_id
+                st.session_state.code_analysis_result = analysis_result
 
         if analysis_result:
             # Display metrics in columns
@@ -343,10 +361,10 @@ def main():
             st.write("Download a comprehensive PDF report of your code analysis.")
             
             # Generate and download PDF
-            pdf_buffer = generate_pdf(analysis_result)
+            pdf_bytes = generate_pdf(analysis_result)
             st.download_button(
                 label="📄 Download PDF Report",
-                data=pdf_buffer,
+                data=pdf_bytes,
                 file_name=f"{uploaded_file.name.split('.')[0]}_analysis.pdf",
                 mime="application/pdf",
                 help="Click to download a PDF version of this analysis"
@@ -1,11 +1,16 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from dateutil import tz
 import numpy as np
+from collections import Counter
 import folium
 from streamlit_folium import st_folium  
-import plotly.express as px
 import plotly.graph_objects as go
 
 
@@ -14,6 +19,17 @@ BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
 FORECAST_URL = "http://api.openweathermap.org/data/2.5/forecast"
 AIR_QUALITY_URL = "http://api.openweathermap.org/data/2.5/air_pollution"
 
+# Shared HTTP session so the OpenWeatherMap calls reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.headers.update({"Accept-Encoding": "gzip"})
+
+# Last ETag and decoded body per request, for conditional GETs once st.cache_data expires.
+# Module-level rather than st.session_state because fetches also run in worker threads.
+ETAG_CACHE = {}
+ETAG_CACHE_SIZE = 128
+
 # List of popular cities for dropdown
 POPULAR_CITIES = [
     "London", "New York", "Tokyo", "Paris", "Berlin", 
@@ -30,36 +46,92 @@ COLOR_PALETTE = {
     'accent': '#32CD32'
 }
 
-
-def apply_custom_styles():
-    """Apply custom CSS styles for better UI"""
-    st.markdown(f"""
+# Custom CSS styles for better UI
+CUSTOM_CSS = """
         <style>
             /* Main container padding */
-            .stApp {{
+            .stApp {
                 padding-top: 0;
-            }}
+            }
             /* Title spacing */
-            h1 {{
+            h1 {
                 margin-top: 0;
                 padding-top: 0;
-            }}
+            }
             /* Remove Streamlit header space */
-            header {{
+            header {
                 display: none;
-            }}
+            }
             /* Adjust sidebar spacing */
-            .css-1vq4p4l {{
+            .css-1vq4p4l {
                 padding-top: 1.5rem;
-            }}
+            }
             /* Main content area padding */
-            .block-container {{
+            .block-container {
                 padding-top: 1rem;
                 padding-bottom: 1rem;
-            }}
+            }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+# Forecast card HTML with the palette colors filled in once; per-day values use str.format
+FORECAST_CARD_TEMPLATE = f"""<div style="
+    flex: 1;
+    background:#33FF33;
+    border-radius: 10px;
+    padding: 15px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    text-align: center;
+    margin-bottom: 10px;
+">
+    <h4 style="margin: 0; color: {COLOR_PALETTE['primary']}">
+        {{day}}
+    </h4>
+    <p style="margin: 5px 0; font-size: 14px;">{{weather}}</p>
+    <p style="margin: 5px 0; font-size: 16px;">
+        <span style="color: {COLOR_PALETTE['secondary']}">↑{{max_temp:.1f}}°</span> / 
+        <span style="color: {COLOR_PALETTE['primary']}">↓{{min_temp:.1f}}°</span>
+    </p>
+    <p style="margin: 5px 0; font-size: 12px;">
+        🌬️ {{wind_speed:.1f}} m/s | 💧 {{humidity:.0f}}%
+    </p>
+</div>"""
+
+# Pollutant reading cell for the air quality grid
+POLLUTANT_CELL_TEMPLATE = """<div style="padding: 5px 0;">
+    <div style="font-size: 14px;">{name}</div>
+    <div style="font-size: 28px;">{value:.1f}</div>
+</div>"""
+
+
+def apply_custom_styles():
+    """Apply custom CSS styles for better UI"""
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_json(url, params):
+    """Fetch an OpenWeatherMap endpoint, cached for its ~10 minute update cadence.
 
+    Failures raise instead of returning None, so they are never cached.
+    """
+    key = (url, tuple(sorted(params.items())))
+    cached = ETAG_CACHE.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    
+    response = SESSION.get(url, params=params, headers=headers, timeout=10)
+    if response.status_code == 304 and cached:
+        # Unchanged since the last fetch: reuse the body we already decoded
+        return cached[1]
+    response.raise_for_status()
+    data = response.json()
+    
+    etag = response.headers.get("ETag")
+    if etag:
+        if len(ETAG_CACHE) >= ETAG_CACHE_SIZE:
+            ETAG_CACHE.clear()
+        ETAG_CACHE[key] = (etag, data)
+    return data
 
 def get_weather_data(city, api_key):
     """Fetch current weather data for a given city."""
@@ -69,8 +141,7 @@ def get_weather_data(city, api_key):
         'units': 'metric',
     }
     try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        return response.json() if response.status_code == 200 else None
+        return fetch_json(BASE_URL, params)
     except requests.exceptions.RequestException:
         return None
 
@@ -82,8 +153,7 @@ def get_forecast_data(city, api_key):
         'units': 'metric',
     }
     try:
-        response = requests.get(FORECAST_URL, params=params, timeout=10)
-        return response.json() if response.status_code == 200 else None
+        return fetch_json(FORECAST_URL, params)
     except requests.exceptions.RequestException:
         return None
 
@@ -95,8 +165,7 @@ def get_air_quality_data(lat, lon, api_key):
         'appid': api_key,
     }
     try:
-        response = requests.get(AIR_QUALITY_URL, params=params, timeout=10)
-        return response.json() if response.status_code == 200 else None
+        return fetch_json(AIR_QUALITY_URL, params)
     except requests.exceptions.RequestException:
         return None
 
@@ -111,36 +180,39 @@ def display_current_weather(data):
     sys = data['sys']
     clouds = data.get('clouds', {}).get('all', 0)
     visibility = data.get('visibility', 'N/A')
+    temp = main['temp']
+    humidity = main['humidity']
+    wind_speed = wind['speed']
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Temperature", f"{main['temp']}°C", 
-                 f"{main['temp'] - main['feels_like']:.1f}°C from feels like")
-        st.metric("Humidity", f"{main['humidity']}%")
+        st.metric("Temperature", f"{temp}°C", 
+                 f"{temp - main['feels_like']:.1f}°C from feels like")
+        st.metric("Humidity", f"{humidity}%")
         
     with col2:
         st.metric("Weather", weather['description'].capitalize())
         st.metric("Cloud Coverage", f"{clouds}%")
         
     with col3:
-        st.metric("Wind", f"{wind['speed']} m/s", 
+        st.metric("Wind", f"{wind_speed} m/s", 
                  f"Direction: {wind.get('deg', 'N/A')}°")
         st.metric("Visibility", 
                  f"{visibility}m" if visibility != 'N/A' else visibility)
     
     # Weather alerts
-    if main['temp'] > 35:
+    if temp > 35:
         st.warning("🔥 Extreme Heat Alert: Temperature is above 35°C! Stay hydrated and avoid prolonged sun exposure.")
-    elif main['temp'] < 0:
+    elif temp < 0:
         st.warning("❄️ Extreme Cold Alert: Temperature is below 0°C! Dress warmly and limit outdoor exposure.")
     
-    if wind['speed'] > 10:
+    if wind_speed > 10:
         st.warning("💨 High Wind Alert: Wind speed exceeds 10 m/s! Secure outdoor objects.")
     
-    if main['humidity'] > 80:
+    if humidity > 80:
         st.info("💧 High Humidity: May feel warmer than actual temperature.")
-    elif main['humidity'] < 30:
+    elif humidity < 30:
         st.info("🏜️ Low Humidity: May cause dry skin and dehydration.")
 
 def display_forecast(forecast_data):
@@ -153,76 +225,80 @@ def display_forecast(forecast_data):
     
     # Process forecast data
     forecast_list = forecast_data['list']
-    daily_data = []
-    
-    for forecast in forecast_list:
-        date = datetime.fromtimestamp(forecast['dt']).strftime('%Y-%m-%d')
-        time = datetime.fromtimestamp(forecast['dt']).strftime('%H:%M')
-        temp = forecast['main']['temp']
-        feels_like = forecast['main']['feels_like']
-        weather = forecast['weather'][0]['description'].capitalize()
-        wind_speed = forecast['wind']['speed']
-        humidity = forecast['main']['humidity']
-        
-        daily_data.append({
-            'Date': date,
-            'Time': time,
-            'Temperature': temp,
-            'Feels Like': feels_like,
-            'Weather': weather,
-            'Wind Speed': wind_speed,
-            'Humidity': humidity
-        })
-    
-    df = pd.DataFrame(daily_data)
-    
-    # Group by date and aggregate data
-    df_grouped = df.groupby('Date').agg({
-        'Temperature': ['min', 'max', 'mean'],
-        'Weather': lambda x: x.mode()[0],
-        'Wind Speed': 'mean',
-        'Humidity': 'mean'
-    }).reset_index()
-    
-    # Flatten multi-index columns and rename
-    df_grouped.columns = ['Date', 'Min Temp', 'Max Temp', 'Avg Temp', 
-                         'Weather', 'Avg Wind Speed', 'Avg Humidity']
-    
-    # Display forecast cards
-    cols = st.columns(len(df_grouped))
-    
-    for idx, (col, row) in enumerate(zip(cols, df_grouped.to_dict('records'))):
-        with col:
-            st.markdown(f"""
-                <div style="
-                    background:#33FF33;
-                    border-radius: 10px;
-                    padding: 15px;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                    text-align: center;
-                    margin-bottom: 10px;
-                ">
-                    <h4 style="margin: 0; color: {COLOR_PALETTE['primary']}">
-                        {datetime.strptime(row['Date'], '%Y-%m-%d').strftime('%a, %b %d')}
-                    </h4>
-                    <p style="margin: 5px 0; font-size: 14px;">{row['Weather']}</p>
-                    <p style="margin: 5px 0; font-size: 16px;">
-                        <span style="color: {COLOR_PALETTE['secondary']}">↑{row['Max Temp']:.1f}°</span> / 
-                        <span style="color: {COLOR_PALETTE['primary']}">↓{row['Min Temp']:.1f}°</span>
-                    </p>
-                    <p style="margin: 5px 0; font-size: 12px;">
-                        🌬️ {row['Avg Wind Speed']:.1f} m/s | 💧 {row['Avg Humidity']:.0f}%
-                    </p>
-                </div>
-            """, unsafe_allow_html=True)
-    
-    # Detailed forecast chart
-    fig = px.line(df, x='Time', y='Temperature', color='Date',
-                  title='Detailed Temperature Forecast',
-                  labels={'Temperature': 'Temperature (°C)', 'Time': 'Time of Day'},
-                  template='plotly_white')
+    n = len(forecast_list)
+    
+    # Convert all timestamps in one vectorized call (local time, as datetime.fromtimestamp gives)
+    timestamps = pd.to_datetime(
+        np.fromiter((forecast['dt'] for forecast in forecast_list), dtype=np.int64, count=n),
+        unit='s', utc=True
+    ).tz_convert(tz.tzlocal())
+    
+    day_keys = np.asarray(timestamps.strftime('%Y-%m-%d'))
+    times = np.asarray(timestamps.strftime('%H:%M'))
+    
+    # Fill one typed column per field instead of building a dict per row
+    temps = np.empty(n, dtype=np.float64)
+    wind_speeds = np.empty(n, dtype=np.float64)
+    humidities = np.empty(n, dtype=np.float64)
+    weathers = [None] * n
+    
+    for i, forecast in enumerate(forecast_list):
+        main = forecast['main']
+        temps[i] = main['temp']
+        weathers[i] = forecast['weather'][0]['description'].capitalize()
+        wind_speeds[i] = forecast['wind']['speed']
+        humidities[i] = main['humidity']
+    
+    # Group by date with NumPy: np.unique gives sorted dates and a group index per row
+    dates, groups = np.unique(day_keys, return_inverse=True)
+    counts = np.bincount(groups)
+    
+    min_temps = np.full(len(dates), np.inf)
+    max_temps = np.full(len(dates), -np.inf)
+    np.minimum.at(min_temps, groups, temps)
+    np.maximum.at(max_temps, groups, temps)
+    
+    # Most common weather per date (ties go to the alphabetically first, as Series.mode does)
+    weather_counts = [Counter() for _ in dates]
+    for group, description in zip(groups, weathers):
+        weather_counts[group][description] += 1
+    
+    df_grouped = pd.DataFrame({
+        'Date': dates,
+        'Min Temp': min_temps,
+        'Max Temp': max_temps,
+        'Avg Temp': np.bincount(groups, weights=temps) / counts,
+        'Weather': [max(sorted(c), key=c.get) for c in weather_counts],
+        'Avg Wind Speed': np.bincount(groups, weights=wind_speeds) / counts,
+        'Avg Humidity': np.bincount(groups, weights=humidities) / counts
+    })
+    
+    # Display forecast cards side by side in a single markdown element
+    cards = "".join(
+        FORECAST_CARD_TEMPLATE.format(
+            day=datetime.strptime(row['Date'], '%Y-%m-%d').strftime('%a, %b %d'),
+            weather=row['Weather'],
+            max_temp=row['Max Temp'],
+            min_temp=row['Min Temp'],
+            wind_speed=row['Avg Wind Speed'],
+            humidity=row['Avg Humidity']
+        )
+        for row in df_grouped.to_dict('records')
+    )
+    st.markdown(f'<div style="display: flex; gap: 10px;">{cards}</div>', unsafe_allow_html=True)
+    
+    # Detailed forecast chart: one WebGL line per date, built straight from the arrays
+    fig = go.Figure([
+        go.Scattergl(x=times[groups == idx], y=temps[groups == idx], mode='lines', name=date)
+        for idx, date in enumerate(dates)
+    ])
     
     fig.update_layout(
+        title='Detailed Temperature Forecast',
+        xaxis_title='Time of Day',
+        yaxis_title='Temperature (°C)',
+        legend_title='Date',
+        template='plotly_white',
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
         font=dict(color=COLOR_PALETTE['text']),
@@ -312,14 +388,14 @@ def display_air_quality(air_quality_data):
         'NH₃': components.get('nh3', 0)
     }
     
-    cols = st.columns(len(pollutants))
-    
-    for col, (name, value) in zip(cols, pollutants.items()):
-        with col:
-            st.metric(name, f"{value:.1f}")
+    cells = "".join(POLLUTANT_CELL_TEMPLATE.format(name=name, value=value) for name, value in pollutants.items())
+    st.markdown(
+        f'<div style="display: grid; grid-template-columns: repeat({len(pollutants)}, 1fr); gap: 8px;">{cells}</div>',
+        unsafe_allow_html=True
+    )
 
-def display_map(lat, lon, city_name):
-    """Display an interactive map with the city's location."""
+def build_map(lat, lon, city_name):
+    """Build the folium map for a location."""
     m = folium.Map(location=[lat, lon], zoom_start=10, tiles='cartodbpositron')
     
     # Add marker with custom icon
@@ -339,6 +415,13 @@ def display_map(lat, lon, city_name):
         fill_color=COLOR_PALETTE['primary']
     ).add_to(m)
     
+    return m
+
+def display_map(lat, lon, city_name):
+    """Display an interactive map with the city's location."""
+    # Built fresh on every run: st_folium writes into the map it renders, so a shared map would keep growing
+    m = build_map(lat, lon, city_name)
+    
     st_folium(m, width=800, height=500, returned_objects=[])
 
 
@@ -429,14 +512,24 @@ def main():
                 # Get coordinates for other APIs
                 lat, lon = current_data['coord']['lat'], current_data['coord']['lon']
                 
+                # Fetch forecast and air quality concurrently. Worker threads are attached to this
+                # script run so the cached fetches and their messages still work.
+                ctx = get_script_run_ctx()
+                with ThreadPoolExecutor(
+                    max_workers=2,
+                    initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+                ) as executor:
+                    forecast_future = executor.submit(get_forecast_data, city, api_key)
+                    air_quality_future = executor.submit(get_air_quality_data, lat, lon, api_key)
+                    forecast_data = forecast_future.result()
+                    air_quality_data = air_quality_future.result()
+                
                 with tab2:
-                    # Fetch and display forecast
-                    forecast_data = get_forecast_data(city, api_key)
+                    # Display forecast
                     display_forecast(forecast_data)
                 
                 with tab3:
-                    # Fetch and display air quality
-                    air_quality_data = get_air_quality_data(lat, lon, api_key)
+                    # Display air quality
                     display_air_quality(air_quality_data)
                 
                 # Display map below all tabs
@@ -1,48 +1,230 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+import functools
+import hashlib
+import httplib2
+import json
 import logging
+import os
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from fpdf import FPDF
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-# Improved backoff strategy with dynamic delay and user-configurable retries
-def backoff_strategy(retries=3, initial_delay=5):
+# Optional: orjson parses API responses straight from bytes, several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON model for the API client that decodes response bodies with orjson
+class OrjsonModel(JsonModel):
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and "data" in body:
+            body = body["data"]
+        return body
+
+# Concurrent API requests; httplib2 connections are not thread-safe, so each worker thread keeps its own
+MAX_FETCH_WORKERS = 8
+thread_local = threading.local()
+
+def thread_http():
+    if not hasattr(thread_local, 'http'):
+        thread_local.http = httplib2.Http(timeout=30)
+    return thread_local.http
+
+# One API client per key, reused across calls and reruns. Requests are executed with thread_http(),
+# so the shared client is never used with its own (non thread-safe) connection.
+@st.cache_resource(show_spinner=False)
+def get_youtube_client(api_key):
+    return build('youtube', 'v3', developerKey=api_key, cache_discovery=False, static_discovery=True,
+                 model=OrjsonModel() if orjson else None)
+
+# ISO-8601 video durations as returned by the API, e.g. "PT1H2M3S" or "P1DT2H"
+DURATION_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+def parse_duration(duration):
+    """Convert an ISO-8601 duration to seconds (0 if it can't be parsed)."""
+    match = DURATION_RE.fullmatch(duration)
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+# Channel IDs are "UC" followed by 22 URL-safe base64 characters
+CHANNEL_ID_RE = re.compile(r'UC[\w-]{22}')
+
+# Persistent cache for API results, so server restarts don't re-spend quota.
+# TTLs (seconds) follow how quickly each kind of data changes.
+DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yt_analyzer")
+CHANNEL_ID_TTL = 30 * 86400
+CHANNEL_STATS_TTL = 3600
+VIDEO_IDS_TTL = 86400
+VIDEO_DETAILS_TTL = 3600
+
+def disk_cache_path(*key_parts):
+    key = hashlib.sha256(repr(key_parts).encode("utf-8")).hexdigest()
+    return os.path.join(DISK_CACHE_DIR, f"{key}.json")
+
+def disk_cache_get(path, ttl):
+    """Return the value stored at path, or None if it is missing, unreadable or older than ttl.
+
+    Expired and unreadable entries are deleted.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        if time.time() - entry["time"] < ttl:
+            return entry["value"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    return None
+
+# Function to delete cache files no reader could still use, including keys that are never asked for again
+# (cached as a resource, so it runs at most once a day per server)
+@st.cache_resource(ttl=86400, show_spinner=False)
+def sweep_disk_cache():
+    max_age = max(CHANNEL_ID_TTL, CHANNEL_STATS_TTL, VIDEO_IDS_TTL, VIDEO_DETAILS_TTL)
+    now = time.time()
+    try:
+        entries = list(os.scandir(DISK_CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime > max_age:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def disk_cache_set(path, value):
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"time": time.time(), "value": value}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not write disk cache entry {path}: {e}")
+
+# Keyword arguments only tune how a value is fetched (e.g. retry settings), so the key uses the positional ones
+def disk_cache(ttl):
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            delay = initial_delay
-            for i in range(retries):
+            path = disk_cache_path(func.__name__, args)
+            value = disk_cache_get(path, ttl)
+            if value is not None:
+                return value
+
+            value = func(*args, **kwargs)
+            # Failures come back as None/[] after reporting an error; only keep real results
+            if value:
+                disk_cache_set(path, value)
+            return value
+        return wrapper
+    return decorator
+
+# 403s are only transient when they are rate limits; quotaExceeded, forbidden, playlistItemsNotAccessible
+# and the like won't succeed on retry
+RETRYABLE_403_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+def is_retryable_error(error):
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    if status != 403:
+        return False
+    try:
+        errors = json.loads(error.content)['error']['errors']
+        return any(item.get('reason') in RETRYABLE_403_REASONS for item in errors)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return False
+
+# Improved backoff strategy with dynamic delay and user-configurable retries.
+# A call can pass retry_settings={'retries': ..., 'initial_delay': ...} (the session's sidebar values)
+# to override the defaults given here.
+def backoff_strategy(retries=3, initial_delay=5):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, retry_settings=None, **kwargs):
+            settings = retry_settings or {}
+            attempts = settings.get('retries', retries)
+            delay = settings.get('initial_delay', initial_delay)
+            for i in range(attempts):
                 try:
                     return func(*args, **kwargs)
                 except HttpError as e:
-                    if e.resp.status in [403, 429]:  # Quota exceeded or rate limit
-                        logging.warning(f"Quota error encountered. Retrying in {delay} seconds...")
-                        time.sleep(delay)
-                        delay *= 2  # Exponential backoff
-                    else:
-                        st.error(f"An HTTP error occurred: {e}")
+                    if not is_retryable_error(e):
                         raise
-                except Exception as e:
-                    st.error(f"An unexpected error occurred: {e}")
-                    raise
-            st.error("Max retries exceeded. Please try again later.")
-            raise Exception("Max retries exceeded. Please try again later.")
+                    if i == attempts - 1:
+                        # Out of attempts on a retryable error
+                        raise Exception("Max retries exceeded. Please try again later.") from e
+                    # Rate limit or server error: honour Retry-After when given, and add jitter
+                    # so concurrent channel fetches don't all retry at the same moment
+                    try:
+                        delay = max(delay, int(e.resp.get('retry-after', delay)))
+                    except ValueError:
+                        pass
+                    wait = delay * random.uniform(0.8, 1.2)
+                    logging.warning(f"Rate limit or server error ({e.resp.status}). Retrying in {wait:.1f} seconds...")
+                    time.sleep(wait)
+                    delay *= 2  # Exponential backoff
         return wrapper
     return decorator
 
-# Fetch channel ID by channel name (with caching)
+# Execute one API request on this thread's connection, retrying rate-limit and server errors.
+# The fetchers report failures themselves, so the retries sit here rather than around them.
+@backoff_strategy()
+def execute_request(request):
+    return request.execute(http=thread_http())
+
+# Fetch channel ID by channel name (with caching). Channel IDs, @handles and legacy usernames are
+# resolved with channels().list (1 quota unit); only other names fall back to search() (100 units).
 @st.cache_data(ttl=3600)
-def get_channel_id(channel_name, api_key):
+@disk_cache(ttl=CHANNEL_ID_TTL)
+def get_channel_id(channel_name, api_key, _retry_settings=None):
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
+        if CHANNEL_ID_RE.fullmatch(channel_name):
+            return channel_name
+
+        youtube = get_youtube_client(api_key)
+        if channel_name.startswith('@'):
+            lookup = {'forHandle': channel_name}
+        elif not any(char.isspace() for char in channel_name):
+            lookup = {'forUsername': channel_name}
+        else:
+            lookup = None
+        if lookup:
+            response = execute_request(youtube.channels().list(part='id', **lookup), retry_settings=_retry_settings)
+            if response.get('items'):
+                return response['items'][0]['id']
+
         request = youtube.search().list(
             part='id',
             q=channel_name,
             type='channel'
         )
-        response = request.execute()
+        response = execute_request(request, retry_settings=_retry_settings)
         if response['items']:
             return response['items'][0]['id']['channelId']
         else:
@@ -52,16 +234,18 @@ def get_channel_id(channel_name, api_key):
         st.error(f"Failed to fetch channel ID for '{channel_name}': {e}")
         return None
 
-# Fetch channel statistics (with caching)
+# Fetch channel statistics and the uploads playlist ID (with caching). channels().list costs 1 quota
+# unit however many parts are requested, so both come from a single call.
 @st.cache_data(ttl=3600)
-def get_channel_stats(channel_id, api_key):
+@disk_cache(ttl=CHANNEL_STATS_TTL)
+def get_channel_stats(channel_id, api_key, _retry_settings=None):
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
+        youtube = get_youtube_client(api_key)
         request = youtube.channels().list(
             part='statistics,snippet,contentDetails',
             id=channel_id
         )
-        response = request.execute()
+        response = execute_request(request, retry_settings=_retry_settings)
         if response['items']:
             channel_info = response['items'][0]
             statistics = channel_info['statistics']
@@ -83,16 +267,17 @@ def get_channel_stats(channel_id, api_key):
 
 # Fetch video IDs from a playlist (with caching)
 @st.cache_data(ttl=3600)
-def get_video_ids(playlist_id, api_key):
+@disk_cache(ttl=VIDEO_IDS_TTL)
+def get_video_ids(playlist_id, api_key, _retry_settings=None):
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
+        youtube = get_youtube_client(api_key)
         video_ids = []
         request = youtube.playlistItems().list(
             part='contentDetails',
             playlistId=playlist_id,
             maxResults=50
         )
-        response = request.execute()
+        response = execute_request(request, retry_settings=_retry_settings)
         for item in response['items']:
             video_ids.append(item['contentDetails']['videoId'])
 
@@ -104,7 +289,7 @@ def get_video_ids(playlist_id, api_key):
                 maxResults=50,
                 pageToken=next_page_token
             )
-            response = request.execute()
+            response = execute_request(request, retry_settings=_retry_settings)
             for item in response['items']:
                 video_ids.append(item['contentDetails']['videoId'])
             next_page_token = response.get('nextPageToken')
@@ -114,41 +299,75 @@ def get_video_ids(playlist_id, api_key):
         st.error(f"Failed to fetch video IDs for playlist '{playlist_id}': {e}")
         return []
 
-# Fetch video details (with caching)
+# Fetch video details in playlist order. The cached lookup is keyed on the sorted IDs,
+# so the same set of videos hits the cache whatever order it arrives in.
+def fetch_video_details(video_ids, api_key, retry_settings=None):
+    details_by_id = fetch_video_details_by_id(tuple(sorted(video_ids)), api_key, _retry_settings=retry_settings)
+    # Videos the API no longer returns are skipped
+    return [details_by_id[video_id] for video_id in video_ids if video_id in details_by_id]
+
+# Fetch video details by ID (with caching). Each video is also cached on disk on its own,
+# so repeat analyses only request videos that are new or whose entry has expired.
 @st.cache_data(ttl=3600)
-def fetch_video_details(video_ids, api_key):
+def fetch_video_details_by_id(video_ids, api_key, _retry_settings=None):
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        video_details = []
-        for video_id in video_ids:
-            request = youtube.videos().list(
+        cache_paths = {video_id: disk_cache_path('video_detail', video_id) for video_id in video_ids}
+        details_by_id = {}
+        missing_ids = []
+        for video_id, path in cache_paths.items():
+            detail = disk_cache_get(path, VIDEO_DETAILS_TTL)
+            if detail is None:
+                missing_ids.append(video_id)
+            else:
+                details_by_id[video_id] = detail
+
+        youtube = get_youtube_client(api_key)
+        # videos().list accepts up to 50 comma-separated IDs per request; the batches are independent,
+        # so they are requested concurrently
+        batch_requests = [
+            youtube.videos().list(
                 part='snippet,statistics,contentDetails',
-                id=video_id
+                id=','.join(missing_ids[start:start + 50])
             )
-            response = request.execute()
-            if response['items']:
-                video_info = response['items'][0]
-                title = video_info['snippet']['title']
-                video_url = f"https://youtube.com/watch?v={video_id}"
-                views = video_info['statistics'].get('viewCount', 0)
-                likes = video_info['statistics'].get('likeCount', 0)
-                comments = video_info['statistics'].get('commentCount', 0)
+            for start in range(0, len(missing_ids), 50)
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            responses = list(executor.map(
+                functools.partial(execute_request, retry_settings=_retry_settings), batch_requests
+            ))
+
+        for response in responses:
+            for video_info in response['items']:
+                # Bind each part once and build the record in a single dict literal
+                video_id = video_info['id']
+                snippet = video_info['snippet']
+                statistics = video_info['statistics']
                 duration = video_info['contentDetails']['duration']
-                published_at = video_info['snippet']['publishedAt']
-                video_details.append({
-                    'Title': title,
-                    'Views': int(views),
-                    'Likes': int(likes),
-                    'Comments': int(comments),
+                detail = {
+                    'Title': snippet['title'],
+                    'Views': int(statistics.get('viewCount', 0)),
+                    'Likes': int(statistics.get('likeCount', 0)),
+                    'Comments': int(statistics.get('commentCount', 0)),
                     'Duration': duration,
-                    'Published At': published_at,
-                    'Video URL': video_url,
-                    'Channel': video_info['snippet']['channelTitle']
-                })
-        return video_details
+                    'Duration (sec)': parse_duration(duration),
+                    'Published At': snippet['publishedAt'],
+                    'Video URL': f"https://youtube.com/watch?v={video_id}",
+                    'Channel': snippet['channelTitle']
+                }
+                details_by_id[video_id] = detail
+                if video_id in cache_paths:
+                    disk_cache_set(cache_paths[video_id], detail)
+
+        return details_by_id
     except Exception as e:
         st.error(f"Failed to fetch video details: {e}")
-        return []
+        return {}
+
+# Build a Plotly Express figure ("bar", "line", ...), cached on its data and arguments so reruns
+# reuse the finished figure instead of rebuilding it
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_figure(chart, data_frame, **kwargs):
+    return getattr(px, chart)(data_frame, **kwargs)
 
 def display_channel_comparison(channel_data):
     try:
@@ -157,7 +376,7 @@ def display_channel_comparison(channel_data):
         df = pd.DataFrame(channel_data)
         metrics = ['Subscribers', 'Views', 'Total_videos']
         
-        fig = px.line(
+        fig = cached_figure('line',
             df, 
             x='Channel_name',
             y=metrics,
@@ -188,9 +407,28 @@ def display_channel_comparison(channel_data):
     except Exception as e:
         st.error(f"Failed to display channel comparison: {str(e)}")
 
-def display_popular_videos(video_details):
-    df = pd.DataFrame(video_details)
-    channels = df['Channel'].unique()
+# Fingerprint of the fetched videos, computed once per fetch. The cached analyses below take it as their
+# key and leave their underscore-prefixed data argument unhashed, so a cache lookup doesn't rehash every video.
+def video_details_key(video_details):
+    content = json.dumps(video_details, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+# All fetched videos as one typed DataFrame, built once per analysis and shared by every section
+# (cached across reruns). Durations are already in seconds; publish times are parsed here once,
+# while 'Published At' keeps the API's string for display.
+@st.cache_data(show_spinner=False)
+def video_frame(video_key, _video_details):
+    df = pd.DataFrame(_video_details)
+    df['Published'] = pd.to_datetime(df['Published At'], format='ISO8601', utc=True)
+    return df
+
+# Top 5 videos per channel from a single sort of the whole frame (cached across reruns)
+@st.cache_data(show_spinner=False)
+def top_videos_by_channel(video_key, _video_df):
+    return _video_df['Channel'].unique(), _video_df.sort_values('Views', ascending=False).groupby('Channel', sort=False).head(5)
+
+def display_popular_videos(video_key, video_df):
+    channels, top_videos_all = top_videos_by_channel(video_key, video_df)
     
     if len(channels) == 1:
         st.subheader(f"Popular Videos from {channels[0]}")
@@ -201,8 +439,7 @@ def display_popular_videos(video_details):
         if len(channels) > 1:
             st.markdown(f"### {channel}")
         
-        channel_videos = df[df['Channel'] == channel]
-        top_videos = channel_videos.sort_values('Views', ascending=False).head(5)
+        top_videos = top_videos_all[top_videos_all['Channel'] == channel]
         
         if not top_videos.empty:
             display_df = top_videos[['Title', 'Views', 'Likes', 'Comments', 'Published At']].reset_index(drop=True)
@@ -213,7 +450,7 @@ def display_popular_videos(video_details):
                 use_container_width=True
             )
             
-            fig = px.bar(
+            fig = cached_figure('bar',
                 top_videos,
                 x='Title',
                 y='Views',
@@ -228,34 +465,45 @@ def display_popular_videos(video_details):
         else:
             st.warning(f"No videos found for {channel}")
 
-def display_trend_analysis(video_details):
+# Monthly views, likes and comments per channel (cached across reruns). Every channel's months are
+# aggregated in one pass, then the result is indexed by channel.
+@st.cache_data(show_spinner=False)
+def monthly_trends(video_key, _video_df):
+    # Truncate to month starts with NumPy's datetime64 casting, about twice as fast as a Period round trip
+    published = _video_df['Published'].dt.tz_localize(None)
+    df = _video_df.assign(Month=published.to_numpy().astype('datetime64[M]').astype(published.dtype))
+    all_channels = df['Channel'].unique()
+    monthly_all = df.groupby(['Channel', 'Month']).agg({
+        'Views': 'sum',
+        'Likes': 'sum',
+        'Comments': 'sum'
+    })
+    monthly_by_channel = {
+        channel: channel_stats.droplevel('Channel').reset_index()
+        for channel, channel_stats in monthly_all.groupby(level='Channel', sort=False)
+    }
+    return all_channels, monthly_by_channel
+
+def display_trend_analysis(video_key, video_df):
     try:
         st.subheader("Channel Performance Trends")
         
-        if not video_details:
+        if video_df.empty:
             st.warning("No video details available")
             return
             
-        df = pd.DataFrame(video_details)
-        df['Published At'] = pd.to_datetime(df['Published At'])
-        df['Month'] = df['Published At'].dt.tz_localize(None).dt.to_period('M').dt.to_timestamp()
-        all_channels = df['Channel'].unique()
+        all_channels, monthly_by_channel = monthly_trends(video_key, video_df)
         if len(all_channels) == 0:
             st.warning("No channels found in the data")
             return
             
         tabs = st.tabs([channel for channel in all_channels])
-        
+
         for tab, channel in zip(tabs, all_channels):
             with tab:
-                channel_df = df[df['Channel'] == channel]
-                monthly_stats = channel_df.groupby('Month').agg({
-                    'Views': 'sum',
-                    'Likes': 'sum',
-                    'Comments': 'sum'
-                }).reset_index()
-                
-                fig = px.line(
+                monthly_stats = monthly_by_channel[channel]
+
+                fig = cached_figure('line',
                     monthly_stats,
                     x='Month',
                     y=['Views', 'Likes', 'Comments'],
@@ -283,197 +531,151 @@ def display_trend_analysis(video_details):
     except Exception as e:
         st.error(f"Error displaying trends: {str(e)}")
 
-def display_shorts_analysis(video_details):
+# Split videos into Shorts (60 seconds or less) and regular videos, with per-channel totals by type (cached across reruns)
+@st.cache_data(show_spinner=False)
+def shorts_breakdown(video_key, _video_df):
+    df = _video_df.assign(**{'Video Type': np.where(_video_df['Duration (sec)'] <= 60, 'Shorts', 'Videos')})
+    by_channel = {}
+    for channel, channel_df in df.groupby('Channel', sort=False):
+        type_stats = channel_df.groupby('Video Type').agg({
+            'Views': 'sum',
+            'Title': 'count'
+        }).rename(columns={'Title': 'Count'}).reset_index()
+        by_channel[channel] = (channel_df, type_stats)
+    return df, by_channel
+
+# Per-channel Shorts/Videos summary table and the long-form frame behind the comparison charts (cached across reruns)
+@st.cache_data(show_spinner=False)
+def shorts_comparison(video_key, _video_df):
+    df, by_channel = shorts_breakdown(video_key, _video_df)
+    channels = list(by_channel)
+    # Count and views per (channel, video type) in one groupby, one row per channel
+    type_totals = df.groupby(['Channel', 'Video Type'], sort=False).agg(
+        Count=('Title', 'size'),
+        Views=('Views', 'sum')
+    ).unstack('Video Type', fill_value=0).reindex(
+        index=channels,
+        columns=pd.MultiIndex.from_product([['Count', 'Views'], ['Shorts', 'Videos']]),
+        fill_value=0
+    )
+    shorts_count = type_totals['Count', 'Shorts']
+    videos_count = type_totals['Count', 'Videos']
+    shorts_views = type_totals['Views', 'Shorts']
+    videos_views = type_totals['Views', 'Videos']
+    total_videos = shorts_count + videos_count
+    total_views = shorts_views + videos_views
+    views_divisor = total_views.where(total_views > 0)
+    
+    summary_stats = pd.DataFrame({
+        'Channel': channels,
+        'Total Videos': total_videos.to_numpy(),
+        'Shorts Count': shorts_count.to_numpy(),
+        'Shorts Percentage': (shorts_count / total_videos * 100).to_numpy(),
+        'Videos Count': videos_count.to_numpy(),
+        'Videos Percentage': (videos_count / total_videos * 100).to_numpy(),
+        'Total Views': total_views.to_numpy(),
+        'Shorts Views': shorts_views.to_numpy(),
+        'Shorts Views Percentage': (shorts_views / views_divisor * 100).fillna(0).to_numpy(),
+        'Videos Views': videos_views.to_numpy(),
+        'Videos Views Percentage': (videos_views / views_divisor * 100).fillna(0).to_numpy()
+    })
+    
+    comparison_df = type_totals.stack().rename_axis(['Channel', 'Type']).reset_index()
+    return summary_stats, comparison_df
+
+# Metrics, charts and top Shorts for a single channel
+def display_channel_shorts(channel, channel_df, type_stats, heading):
+    total_videos = len(channel_df)
+    total_views = channel_df['Views'].sum()
+    shorts_count = type_stats[type_stats['Video Type'] == 'Shorts']['Count'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
+    shorts_views = type_stats[type_stats['Video Type'] == 'Shorts']['Views'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
+    
+    st.markdown(heading)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total Videos", total_videos)
+        st.metric("Shorts Count", shorts_count, f"{shorts_count/total_videos*100:.1f}% of total")
+    with col2:
+        st.metric("Total Views", f"{total_views:,}")
+        st.metric("Shorts Views", f"{shorts_views:,}", f"{shorts_views/total_views*100:.1f}% of total" if total_views > 0 else "0%")
+    
+    tab1, tab2, tab3 = st.tabs(["Count Comparison", "Views Comparison", "Top Shorts"])
+    
+    with tab1:
+        fig_count = cached_figure('bar',
+            type_stats,
+            x='Video Type',
+            y='Count',
+            title="Shorts vs Regular Videos Count",
+            labels={'Video Type': 'Video Type', 'Count': 'Number of Videos'},
+            color='Video Type'
+        )
+        st.plotly_chart(fig_count, use_container_width=True)
+        
+        fig_pie_count = cached_figure('pie',
+            type_stats,
+            names='Video Type',
+            values='Count',
+            title="Percentage of Shorts vs Regular Videos",
+            labels={'Video Type': 'Video Type'}
+        )
+        st.plotly_chart(fig_pie_count, use_container_width=True)
+    
+    with tab2:
+        fig_views = cached_figure('bar',
+            type_stats,
+            x='Video Type',
+            y='Views',
+            title="Views from Shorts vs Regular Videos",
+            labels={'Video Type': 'Video Type', 'Views': 'Total Views'},
+            color='Video Type'
+        )
+        st.plotly_chart(fig_views, use_container_width=True)
+        
+        fig_pie_views = cached_figure('pie',
+            type_stats,
+            names='Video Type',
+            values='Views',
+            title="Percentage of Views from Shorts vs Regular Videos",
+            labels={'Video Type': 'Video Type'}
+        )
+        st.plotly_chart(fig_pie_views, use_container_width=True)
+    
+    with tab3:
+        shorts_df = channel_df[channel_df['Video Type'] == 'Shorts']
+        if not shorts_df.empty:
+            display_df = shorts_df.sort_values('Views', ascending=False).head(10)[['Title', 'Views', 'Likes', 'Comments', 'Published At']].reset_index(drop=True)
+            display_df.index = display_df.index + 1
+            st.dataframe(
+                display_df,
+                use_container_width=True
+            )
+        else:
+            st.warning(f"No shorts found for {channel}")
+
+def display_shorts_analysis(video_key, video_df):
     try:
         st.subheader("Shorts Performance Analysis by Channel")
-        if not video_details:
+        if video_df.empty:
             st.warning("No video details available")
             return
             
-        df = pd.DataFrame(video_details)
-        df['Duration (sec)'] = pd.to_timedelta(df['Duration']).dt.total_seconds()
-        df['Video Type'] = df['Duration (sec)'].apply(lambda x: 'Shorts' if x <= 60 else 'Videos')
-        channels = df['Channel'].unique()
+        df, by_channel = shorts_breakdown(video_key, video_df)
+        channels = list(by_channel)
         
         if len(channels) == 1:
             channel = channels[0]
-            channel_df = df[df['Channel'] == channel]
-            type_stats = channel_df.groupby('Video Type').agg({
-                'Views': 'sum',
-                'Title': 'count'
-            }).rename(columns={'Title': 'Count'}).reset_index()
-            
-            total_videos = len(channel_df)
-            total_views = channel_df['Views'].sum()
-            shorts_count = type_stats[type_stats['Video Type'] == 'Shorts']['Count'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
-            shorts_views = type_stats[type_stats['Video Type'] == 'Shorts']['Views'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
-            
-            st.markdown(f"### {channel}")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Total Videos", total_videos)
-                st.metric("Shorts Count", shorts_count, f"{shorts_count/total_videos*100:.1f}% of total")
-            with col2:
-                st.metric("Total Views", f"{total_views:,}")
-                st.metric("Shorts Views", f"{shorts_views:,}", f"{shorts_views/total_views*100:.1f}% of total" if total_views > 0 else "0%")
-            
-            tab1, tab2, tab3 = st.tabs(["Count Comparison", "Views Comparison", "Top Shorts"])
-            
-            with tab1:
-                fig_count = px.bar(
-                    type_stats,
-                    x='Video Type',
-                    y='Count',
-                    title="Shorts vs Regular Videos Count",
-                    labels={'Video Type': 'Video Type', 'Count': 'Number of Videos'},
-                    color='Video Type'
-                )
-                st.plotly_chart(fig_count, use_container_width=True)
-                
-                fig_pie_count = px.pie(
-                    type_stats,
-                    names='Video Type',
-                    values='Count',
-                    title="Percentage of Shorts vs Regular Videos",
-                    labels={'Video Type': 'Video Type'}
-                )
-                st.plotly_chart(fig_pie_count, use_container_width=True)
-            
-            with tab2:
-                fig_views = px.bar(
-                    type_stats,
-                    x='Video Type',
-                    y='Views',
-                    title="Views from Shorts vs Regular Videos",
-                    labels={'Video Type': 'Video Type', 'Views': 'Total Views'},
-                    color='Video Type'
-                )
-                st.plotly_chart(fig_views, use_container_width=True)
-                
-                fig_pie_views = px.pie(
-                    type_stats,
-                    names='Video Type',
-                    values='Views',
-                    title="Percentage of Views from Shorts vs Regular Videos",
-                    labels={'Video Type': 'Video Type'}
-                )
-                st.plotly_chart(fig_pie_views, use_container_width=True)
-            
-            with tab3:
-                shorts_df = channel_df[channel_df['Video Type'] == 'Shorts']
-                if not shorts_df.empty:
-                    display_df = shorts_df.sort_values('Views', ascending=False).head(10)[['Title', 'Views', 'Likes', 'Comments', 'Published At']].reset_index(drop=True)
-                    display_df.index = display_df.index + 1
-                    st.dataframe(
-                        display_df,
-                        use_container_width=True
-                    )
-                else:
-                    st.warning(f"No shorts found for {channel}")
+            display_channel_shorts(channel, *by_channel[channel], f"### {channel}")
         
         else:
             tabs = st.tabs([f"{channel}" for channel in channels])
             
             for tab, channel in zip(tabs, channels):
                 with tab:
-                    channel_df = df[df['Channel'] == channel]
-                    type_stats = channel_df.groupby('Video Type').agg({
-                        'Views': 'sum',
-                        'Title': 'count'
-                    }).rename(columns={'Title': 'Count'}).reset_index()
-                    
-                    total_videos = len(channel_df)
-                    total_views = channel_df['Views'].sum()
-                    shorts_count = type_stats[type_stats['Video Type'] == 'Shorts']['Count'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
-                    shorts_views = type_stats[type_stats['Video Type'] == 'Shorts']['Views'].values[0] if not type_stats[type_stats['Video Type'] == 'Shorts'].empty else 0
-                    
-                    st.markdown(f"### {channel} Shorts Analysis")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Total Videos", total_videos)
-                        st.metric("Shorts Count", shorts_count, f"{shorts_count/total_videos*100:.1f}% of total")
-                    with col2:
-                        st.metric("Total Views", f"{total_views:,}")
-                        st.metric("Shorts Views", f"{shorts_views:,}", f"{shorts_views/total_views*100:.1f}% of total" if total_views > 0 else "0%")
-                    
-                    subtab1, subtab2, subtab3 = st.tabs(["Count Comparison", "Views Comparison", "Top Shorts"])
-                    
-                    with subtab1:
-                        fig_count = px.bar(
-                            type_stats,
-                            x='Video Type',
-                            y='Count',
-                            title="Shorts vs Regular Videos Count",
-                            labels={'Video Type': 'Video Type', 'Count': 'Number of Videos'},
-                            color='Video Type'
-                        )
-                        st.plotly_chart(fig_count, use_container_width=True)
-                        
-                        fig_pie_count = px.pie(
-                            type_stats,
-                            names='Video Type',
-                            values='Count',
-                            title="Percentage of Shorts vs Regular Videos",
-                            labels={'Video Type': 'Video Type'}
-                        )
-                        st.plotly_chart(fig_pie_count, use_container_width=True)
-                    
-                    with subtab2:
-                        fig_views = px.bar(
-                            type_stats,
-                            x='Video Type',
-                            y='Views',
-                            title="Views from Shorts vs Regular Videos",
-                            labels={'Video Type': 'Video Type', 'Views': 'Total Views'},
-                            color='Video Type'
-                        )
-                        st.plotly_chart(fig_views, use_container_width=True)
-                        
-                        fig_pie_views = px.pie(
-                            type_stats,
-                            names='Video Type',
-                            values='Views',
-                            title="Percentage of Views from Shorts vs Regular Videos",
-                            labels={'Video Type': 'Video Type'}
-                        )
-                        st.plotly_chart(fig_pie_views, use_container_width=True)
-                    
-                    with subtab3:
-                        shorts_df = channel_df[channel_df['Video Type'] == 'Shorts']
-                        if not shorts_df.empty:
-                            display_df = shorts_df.sort_values('Views', ascending=False).head(10)[['Title', 'Views', 'Likes', 'Comments', 'Published At']].reset_index(drop=True)
-                            display_df.index = display_df.index + 1
-                            st.dataframe(
-                                display_df,
-                                use_container_width=True
-                            )
-                        else:
-                            st.warning(f"No shorts found for {channel}")
+                    display_channel_shorts(channel, *by_channel[channel], f"### {channel} Shorts Analysis")
             
             st.markdown("### Channel Comparison: Shorts vs Videos Performance")
-            summary_stats = []
-            for channel in channels:
-                channel_df = df[df['Channel'] == channel]
-                total_videos = len(channel_df)
-                shorts_count = len(channel_df[channel_df['Video Type'] == 'Shorts'])
-                videos_count = len(channel_df[channel_df['Video Type'] == 'Videos'])
-                total_views = channel_df['Views'].sum()
-                shorts_views = channel_df[channel_df['Video Type'] == 'Shorts']['Views'].sum()
-                videos_views = channel_df[channel_df['Video Type'] == 'Videos']['Views'].sum()
-                
-                summary_stats.append({
-                    'Channel': channel,
-                    'Total Videos': total_videos,
-                    'Shorts Count': shorts_count,
-                    'Shorts Percentage': (shorts_count / total_videos * 100) if total_videos > 0 else 0,
-                    'Videos Count': videos_count,
-                    'Videos Percentage': (videos_count / total_videos * 100) if total_videos > 0 else 0,
-                    'Total Views': total_views,
-                    'Shorts Views': shorts_views,
-                    'Shorts Views Percentage': (shorts_views / total_views * 100) if total_views > 0 else 0,
-                    'Videos Views': videos_views,
-                    'Videos Views Percentage': (videos_views / total_views * 100) if total_views > 0 else 0
-                })
+            summary_stats, comparison_df = shorts_comparison(video_key, video_df)
             
             summary_df = pd.DataFrame(summary_stats).reset_index(drop=True)
             summary_df.index = summary_df.index + 1
@@ -494,26 +696,11 @@ def display_shorts_analysis(video_details):
                 use_container_width=True
             )
             
-            comparison_data = []
-            for channel in channels:
-                channel_df = df[df['Channel'] == channel]
-                shorts_count = len(channel_df[channel_df['Video Type'] == 'Shorts'])
-                videos_count = len(channel_df[channel_df['Video Type'] == 'Videos'])
-                shorts_views = channel_df[channel_df['Video Type'] == 'Shorts']['Views'].sum()
-                videos_views = channel_df[channel_df['Video Type'] == 'Videos']['Views'].sum()
-                
-                comparison_data.extend([
-                    {'Channel': channel, 'Type': 'Shorts', 'Count': shorts_count, 'Views': shorts_views},
-                    {'Channel': channel, 'Type': 'Videos', 'Count': videos_count, 'Views': videos_views}
-                ])
-            
-            comparison_df = pd.DataFrame(comparison_data)
-
             st.write("#### Video Count and Views Comparison")
             col1, col2 = st.columns(2)
             
             with col1:
-                fig_count = px.bar(
+                fig_count = cached_figure('bar',
                     comparison_df,
                     x='Channel',
                     y='Count',
@@ -531,7 +718,7 @@ def display_shorts_analysis(video_details):
                 st.plotly_chart(fig_count, use_container_width=True)
             
             with col2:
-                fig_views = px.bar(
+                fig_views = cached_figure('bar',
                     comparison_df,
                     x='Channel',
                     y='Views',
@@ -551,47 +738,67 @@ def display_shorts_analysis(video_details):
     except Exception as e:
         st.error(f"Failed to display shorts analysis: {e}")
 
-def display_video_duration_analysis(video_details):
+# Videos bucketed into short, medium and long durations (cached across reruns)
+@st.cache_data(show_spinner=False)
+def duration_categories(video_key, _video_df):
+    # Durations are parsed to seconds once, when the videos are fetched
+    df = _video_df.assign(**{'Duration (minutes)': _video_df['Duration (sec)'] / 60})
+
+    df['Duration Category'] = pd.cut(
+        df['Duration (minutes)'],
+        bins=[0, 5, 20, float('inf')],
+        labels=['Short (<5 mins)', 'Medium (5-20 mins)', 'Long (>20 mins)']
+    )
+    return df
+
+def display_video_duration_analysis(video_key, video_df):
     try:
         st.subheader("Video Duration Analysis")
-        if not video_details:
+        if video_df.empty:
             st.warning("No video details available")
             return
             
-        df = pd.DataFrame(video_details)
-        df['Duration (minutes)'] = pd.to_timedelta(df['Duration']).dt.total_seconds() / 60
-
-        df['Duration Category'] = pd.cut(
-            df['Duration (minutes)'],
-            bins=[0, 5, 20, float('inf')],
-            labels=['Short (<5 mins)', 'Medium (5-20 mins)', 'Long (>20 mins)']
-        )
-
-        fig = px.histogram(df, x='Duration Category', color='Channel',
-                          title="Video Duration Distribution by Channel",
-                          barmode='group')
+        df = duration_categories(video_key, video_df)
+        fig = cached_figure('histogram', df, x='Duration Category', color='Channel',
+                            title="Video Duration Distribution by Channel",
+                            barmode='group')
         st.plotly_chart(fig)
     except Exception as e:
         st.error(f"Failed to display video duration analysis: {e}")
 
-def display_publishing_frequency_analysis(video_details):
+# Number of videos published per day and channel (cached across reruns)
+@st.cache_data(show_spinner=False)
+def daily_publish_counts(video_key, _video_df):
+    published_day = _video_df['Published'].dt.floor('D').rename('Published At')
+    return _video_df.groupby([published_day, 'Channel']).size().reset_index(name='Count')
+
+def display_publishing_frequency_analysis(video_key, video_df):
     try:
         st.subheader("Publishing Frequency Analysis")
-        if not video_details:
+        if video_df.empty:
             st.warning("No video details available")
             return
             
-        df = pd.DataFrame(video_details)
-        df['Published At'] = pd.to_datetime(df['Published At'])
-        
-        df_counts = df.groupby([pd.Grouper(key='Published At', freq='D'), 'Channel']).size().reset_index(name='Count')
+        df_counts = daily_publish_counts(video_key, video_df)
         
-        fig = px.line(df_counts, x='Published At', y='Count', color='Channel',
-                     title="Publishing Frequency Over Time by Channel")
+        fig = cached_figure('line', df_counts, x='Published At', y='Count', color='Channel',
+                            title="Publishing Frequency Over Time by Channel")
         st.plotly_chart(fig)
     except Exception as e:
         st.error(f"Failed to display publishing frequency analysis: {e}")
 
+# Expander sections: title, key of the toggle that loads it, renderer and the cached analysis behind it.
+# Only sections whose toggle is on are computed; their analyses don't depend on each other, so main()
+# runs them concurrently and renders each section from the warm cache as soon as its analysis finishes
+# (shorts_comparison also fills shorts_breakdown).
+ANALYSIS_SECTIONS = [
+    ("Popular Videos", "load_popular_videos", display_popular_videos, top_videos_by_channel),
+    ("Trend Analysis", "load_trend_analysis", display_trend_analysis, monthly_trends),
+    ("Shorts Performance", "load_shorts_analysis", display_shorts_analysis, shorts_comparison),
+    ("Video Duration Analysis", "load_duration_analysis", display_video_duration_analysis, duration_categories),
+    ("Publishing Frequency Analysis", "load_publishing_frequency", display_publishing_frequency_analysis, daily_publish_counts),
+]
+
 def generate_pdf_report(channel_data, video_details):
     pdf = FPDF()
     pdf.add_page()
@@ -604,44 +811,64 @@ def generate_pdf_report(channel_data, video_details):
             return text.encode('ascii', 'ignore').decode('ascii')
         return str(text)
 
-    # Add channel comparison data
+    # Add channel comparison data; each cell also moves to the next line, replacing cell + ln pairs
     pdf.cell(200, 10, text="Channel Comparison", align="C")
     pdf.ln(10)
     for channel in channel_data:
-        pdf.cell(200, 10, text=remove_emojis(f"Channel: {channel['Channel_name']}"))
-        pdf.ln()  # Move to next line
-        pdf.cell(200, 10, text=remove_emojis(f"Subscribers: {channel['Subscribers']}"))
-        pdf.ln() 
-        pdf.cell(200, 10, text=remove_emojis(f"Views: {channel['Views']}"))
-        pdf.ln() 
-        pdf.cell(200, 10, text=remove_emojis(f"Total Videos: {channel['Total_videos']}"))
-        pdf.ln(10)
+        for line in (
+            f"Channel: {channel['Channel_name']}",
+            f"Subscribers: {channel['Subscribers']}",
+            f"Views: {channel['Views']}",
+            f"Total Videos: {channel['Total_videos']}"
+        ):
+            pdf.cell(200, 10, text=remove_emojis(line), new_x="LMARGIN", new_y="NEXT")
 
-    # Add video details
+    # Add video details, followed by a blank line per video
     pdf.cell(200, 10, text="Video Details", align="C")
     pdf.ln(10)
     for video in video_details:
-        pdf.cell(200, 10, text=remove_emojis(f"Channel: {video.get('Channel', 'N/A')}"))
-        pdf.ln()  
-        pdf.cell(200, 10, text=remove_emojis(f"Title: {video['Title']}"))
-        pdf.ln()  
-        pdf.cell(200, 10, text=remove_emojis(f"Views: {video['Views']}"))
-        pdf.ln() 
-        pdf.cell(200, 10, text=remove_emojis(f"Likes: {video['Likes']}"))
-        pdf.ln()  
-        pdf.cell(200, 10, text=remove_emojis(f"Comments: {video['Comments']}"))
-        pdf.ln()
-        pdf.ln()
-
-
-    # Save the PDF to a file
-    pdf_file = "analysis_report.pdf"
-    pdf.output(pdf_file)
-    return pdf_file
+        for line in (
+            f"Channel: {video.get('Channel', 'N/A')}",
+            f"Title: {video['Title']}",
+            f"Views: {video['Views']}",
+            f"Likes: {video['Likes']}",
+            f"Comments: {video['Comments']}"
+        ):
+            pdf.cell(200, 10, text=remove_emojis(line), new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(10)
+
+    # Render the PDF in memory; fpdf2 returns a bytearray when no file name is given
+    return bytes(pdf.output())
+
+# Reports are rendered in the background, so building one never blocks a script run
+PDF_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Placeholder shown while the report renders. Only this fragment reruns while polling; once the
+# report is done the whole app reruns to swap in the download button.
+@st.fragment(run_every=1)
+def display_pdf_progress(pdf_future):
+    if pdf_future.done():
+        st.rerun()
+    st.info("PDF report is still rendering...")
+
+# Fetch one channel's statistics and video details (runs in a worker thread)
+def fetch_channel_data(channel_name, api_key, retry_settings):
+    channel_id = get_channel_id(channel_name, api_key, _retry_settings=retry_settings)
+    if not channel_id:
+        return None, []
+    channel_stats = get_channel_stats(channel_id, api_key, _retry_settings=retry_settings)
+    if not channel_stats:
+        return None, []
+    video_ids = get_video_ids(channel_stats['playlist_id'], api_key, _retry_settings=retry_settings)
+    video_details = fetch_video_details(video_ids, api_key, retry_settings) if video_ids else []
+    for video in video_details:
+        video['Channel'] = channel_stats['Channel_name']
+    return channel_stats, video_details
 
 def main():
     
     st.title("YouTube Channel Analyzer")
+    sweep_disk_cache()
 
     with st.sidebar:
         st.header("⚙️ Configuration")
@@ -650,6 +877,8 @@ def main():
         channel_names = [name.strip() for name in channel_names if name.strip()]
         retries = st.slider("🔄 Retry attempts for API calls", min_value=1, max_value=10, value=3)
         initial_delay = st.slider("⏱️ Initial delay for retries (seconds)", min_value=1, max_value=10, value=5)
+        # This session's retry settings, passed down to every API call it makes
+        retry_settings = {'retries': retries, 'initial_delay': initial_delay}
 
     if st.sidebar.button("Analyze"):
         if not api_key:
@@ -667,61 +896,110 @@ def main():
             total_channels = len(channel_names)
             
             with st.spinner("Fetching channel data..."):
-                for i, channel_name in enumerate(channel_names):
+                for channel_name in channel_names:
                     st.info(f"Fetching data for channel: {channel_name}")
-                    channel_id = get_channel_id(channel_name, api_key)
-                    if channel_id:
-                        channel_stats = get_channel_stats(channel_id, api_key)
-                        if channel_stats:
-                            channel_data.append(channel_stats)
-                            playlist_id = channel_stats['playlist_id']
-                            video_ids = get_video_ids(playlist_id, api_key)
-                            if video_ids:
-                                video_details = fetch_video_details(video_ids, api_key)
-                                for video in video_details:
-                                    video['Channel'] = channel_stats['Channel_name']
-                                video_details_all.extend(video_details)
-                    progress_bar.progress((i + 1) / total_channels)
-
-            if channel_data:
-                st.success("Data fetching complete!")
-                
-                with st.expander("Channel Comparison", expanded=True):
-                    display_channel_comparison(channel_data)
+
+                # Fetch the channels concurrently. Worker threads are attached to this script run so
+                # cached calls and their warnings still work; results are kept in input order.
+                ctx = get_script_run_ctx()
+                results = [None] * total_channels
+                with ThreadPoolExecutor(
+                    max_workers=min(MAX_FETCH_WORKERS, total_channels),
+                    initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+                ) as executor:
+                    futures = {
+                        executor.submit(fetch_channel_data, channel_name, api_key, retry_settings): i
+                        for i, channel_name in enumerate(channel_names)
+                    }
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        results[futures[future]] = future.result()
+                        progress_bar.progress(done / total_channels)
+
+                for channel_stats, video_details in results:
+                    if channel_stats:
+                        channel_data.append(channel_stats)
+                        video_details_all.extend(video_details)
+
+            # Drop videos fetched twice (e.g. the same channel entered twice), keeping the first occurrence
+            unique_videos = {}
+            for video in video_details_all:
+                unique_videos.setdefault(video['Video URL'], video)
+            video_details_all = list(unique_videos.values())
+
+            # Keep the results so later reruns (e.g. from the report button) show them without refetching
+            st.session_state.channel_analysis_result = (channel_data, video_details_all, video_details_key(video_details_all))
+            st.session_state.pop('pdf_report', None)
+        except Exception as e:
+            st.session_state.pop('channel_analysis_result', None)
+            st.error(f"An error occurred during analysis: {e}")
+            return
+
+    if 'channel_analysis_result' not in st.session_state:
+        return
+    channel_data, video_details_all, video_key = st.session_state.channel_analysis_result
+
+    try:
+        if channel_data:
+            st.success("Data fetching complete!")
+            
+            with st.expander("Channel Comparison", expanded=True):
+                display_channel_comparison(channel_data)
+            
+            if video_details_all:
+                # Start rendering the report right away, once per analysis, so it is usually ready by the
+                # time the user scrolls down to it
+                if 'pdf_report' not in st.session_state:
+                    st.session_state.pdf_report = PDF_EXECUTOR.submit(generate_pdf_report, channel_data, video_details_all)
+
+                # Lay out every section first, then run the loaded sections' analyses concurrently and
+                # fill each one in on this thread as soon as its analysis finishes. Sections are only
+                # computed once their toggle is switched on, and stay loaded across reruns.
+                video_df = video_frame(video_key, video_details_all)
+                status_area = st.empty()
+                placeholders = {}
+                for title, key, display_section, analysis in ANALYSIS_SECTIONS:
+                    with st.expander(title):
+                        if st.toggle("Load analysis", key=key):
+                            placeholders[analysis] = (st.empty(), display_section)
+
+                if placeholders:
+                    ctx = get_script_run_ctx()
+                    with status_area.status("Running analyses...") as status:
+                        with ThreadPoolExecutor(
+                            max_workers=len(placeholders),
+                            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+                        ) as executor:
+                            futures = {executor.submit(analysis, video_key, video_df): analysis for analysis in placeholders}
+                            # A failed analysis is retried and reported by its section's renderer
+                            for done, future in enumerate(as_completed(futures), start=1):
+                                placeholder, display_section = placeholders[futures[future]]
+                                with placeholder.container():
+                                    display_section(video_key, video_df)
+                                status.update(label=f"Running analyses... ({done}/{len(futures)})")
+                        status.update(label="Analyses complete", state="complete", expanded=False)
+
+                st.markdown("---")
+                st.subheader("📊 Report Generation")
                 
-                if video_details_all:
-                    with st.expander("Popular Videos"):
-                        display_popular_videos(video_details_all)
-                    with st.expander("Trend Analysis"):
-                        display_trend_analysis(video_details_all)
-                    with st.expander("Shorts Performance"):
-                        display_shorts_analysis(video_details_all)
-                    with st.expander("Video Duration Analysis"):
-                        display_video_duration_analysis(video_details_all)
-                    with st.expander("Publishing Frequency Analysis"):
-                        display_publishing_frequency_analysis(video_details_all)
-
-                    st.markdown("---")
-                    st.subheader("📊 Report Generation")
-                    
-                    if st.write("Click below button to Generate and Download PDF........"):
-                       st.write("")
-                    else:
-                       pdf_file = generate_pdf_report(channel_data, video_details_all)
-                       with open(pdf_file, "rb") as file:
-                         st.download_button(
-                         label="⬇️ Download Analysis Report",
-                         data=file,
-                         file_name="analysis_report.pdf",
-                         mime="application/pdf"
-                         )
+                pdf_future = st.session_state.pdf_report
+                if not pdf_future.done():
+                    display_pdf_progress(pdf_future)
+                elif pdf_future.exception():
+                    st.error(f"Failed to generate PDF report: {pdf_future.exception()}")
                 else:
-                    st.warning("No video details were fetched for the channels.")
-                   
+                    st.download_button(
+                        label="⬇️ Download Analysis Report",
+                        data=pdf_future.result(),
+                        file_name="analysis_report.pdf",
+                        mime="application/pdf"
+                    )
             else:
-                st.error("No channel data was fetched. Please check your channel names and API key.")
-        except Exception as e:
-            st.error(f"An error occurred during analysis: {e}")
+                st.warning("No video details were fetched for the channels.")
+               
+        else:
+            st.error("No channel data was fetched. Please check your channel names and API key.")
+    except Exception as e:
+        st.error(f"An error occurred during analysis: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file